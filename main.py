@@ -2,21 +2,52 @@
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
 from dotenv import load_dotenv
-from langchain_core.messages import HumanMessage, AIMessage
+from langchain_core.messages import HumanMessage
 from src.agent_graph import agent_graph
-from src.vectorstore import create_collection_if_not_exists
+from src.vectorstore import create_collection_if_not_exists, close_clients
+from src.tools.stock_tool import close_client as close_stock_client
 from langsmith import traceable, Client
+from prometheus_client import make_asgi_app
 from langsmith.run_helpers import get_current_run_tree
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+import asyncio
+import orjson
 import uvicorn
 import os
+import time
 
 # Load environment variables
 load_dotenv()
 
-# Initialize LangSmith client for feedback
-langsmith_client = Client()
+# Initialize LangSmith client for feedback; it pools its own connections.
+# The timeout caps how long a single call can hold a feedback thread
+LANGSMITH_TIMEOUT_MS = 5000
+langsmith_client = Client(
+    retry_config=Retry(connect=3, backoff_factor=0.2),
+    timeout_ms=LANGSMITH_TIMEOUT_MS,
+)
+
+# Feedback is submitted to LangSmith in the background from a bounded queue
+FEEDBACK_QUEUE_SIZE = 1000
+FEEDBACK_WORKERS = 4
+FEEDBACK_DRAIN_TIMEOUT = 10  # seconds to keep submitting queued feedback on shutdown
+feedback_queue: asyncio.Queue = asyncio.Queue(maxsize=FEEDBACK_QUEUE_SIZE)
+feedback_tasks: list[asyncio.Task] = []
+feedback_in_flight = 0
+
+# Dedicated threads, so shutdown need not wait for a stuck LangSmith call
+# the way it would for the loop's default executor
+feedback_executor = ThreadPoolExecutor(
+    max_workers=FEEDBACK_WORKERS, thread_name_prefix="feedback"
+)
+
+# Stream events are coalesced into windows of this many seconds
+STREAM_FLUSH_INTERVAL = 0.05
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -36,6 +67,55 @@ async def startup_event():
     except Exception as e:
         print(f"⚠ Warning: Could not initialize Qdrant collection: {e}")
 
+    for _ in range(FEEDBACK_WORKERS):
+        feedback_tasks.append(asyncio.create_task(feedback_worker()))
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Flush pending feedback and close shared HTTP clients on shutdown."""
+    try:
+        await asyncio.wait_for(feedback_queue.join(), FEEDBACK_DRAIN_TIMEOUT)
+    except asyncio.TimeoutError:
+        pending = feedback_queue.qsize() + feedback_in_flight
+        print(f"⚠ Warning: Shutting down with {pending} feedback items unsent")
+    for task in feedback_tasks:
+        task.cancel()
+    feedback_executor.shutdown(wait=False, cancel_futures=True)
+
+    await close_stock_client()
+    await close_clients()
+
+
+async def feedback_worker():
+    """Submit queued feedback to LangSmith without blocking requests."""
+    global feedback_in_flight
+
+    loop = asyncio.get_running_loop()
+    while True:
+        feedback = await feedback_queue.get()
+        feedback_in_flight += 1
+        try:
+            await loop.run_in_executor(
+                feedback_executor,
+                partial(
+                    langsmith_client.create_feedback,
+                    run_id=feedback.run_id,
+                    key="user_feedback",
+                    score=feedback.score,
+                    comment=feedback.comment,
+                ),
+            )
+        except Exception as e:
+            print(f"⚠ Warning: Could not submit feedback for run {feedback.run_id}: {e}")
+        finally:
+            feedback_in_flight -= 1
+            feedback_queue.task_done()
+
+
+# Prometheus metrics (e.g. search cache hit rate)
+app.mount("/metrics", make_asgi_app())
+
 
 # CORS middleware
 app.add_middleware(
@@ -70,11 +150,17 @@ async def root():
     return {
         "status": "ok",
         "message": "RAG Agent API is running",
-        "tools": ["search_knowledge_base", "stock_info"],
+        "tools": [
+            "search_knowledge_base",
+            "search_knowledge_base_batch",
+            "stock_info",
+        ],
     }
 
 
-@app.post("/chat", response_model=ChatResponse)
+# The response is built from trusted values, so skip response_model
+# validation; ChatResponse still documents the schema in OpenAPI
+@app.post("/chat", responses={200: {"model": ChatResponse}})
 @traceable(name="Chat", metadata={"endpoint": "/chat"})
 async def chat(request: ChatRequest):
     """Chat endpoint that processes queries using the agent with tools."""
@@ -85,7 +171,7 @@ async def chat(request: ChatRequest):
         run_id = str(run_tree.id) if run_tree else None
 
         # Run the agent graph
-        result = agent_graph.invoke(
+        result = await agent_graph.ainvoke(
             {"messages": [HumanMessage(content=request.query)]},
             {"metadata": {"user_query": request.query}},
         )
@@ -93,46 +179,126 @@ async def chat(request: ChatRequest):
         # Extract the final answer
         messages = result["messages"]
         final_message = messages[-1]
+        answer = getattr(final_message, "content", None)
+        if answer is None:
+            answer = str(final_message)
 
         # Extract tool calls from messages
-        tool_calls = []
-        for msg in messages:
-            if hasattr(msg, "tool_calls") and msg.tool_calls:
-                for tool_call in msg.tool_calls:
-                    tool_calls.append(tool_call["name"])
-
-        return {
-            "query": request.query,
-            "answer": (
-                final_message.content
-                if isinstance(final_message, AIMessage)
-                else str(final_message)
+        tool_calls = [
+            tool_call["name"]
+            for msg in messages
+            if getattr(msg, "tool_calls", None)
+            for tool_call in msg.tool_calls
+        ]
+
+        return Response(
+            orjson.dumps(
+                {
+                    "query": request.query,
+                    "answer": answer,
+                    "tool_calls": tool_calls,
+                    "run_id": run_id,
+                }
             ),
-            "tool_calls": tool_calls,
-            "run_id": run_id,
-        }
+            media_type="application/json",
+        )
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.post("/feedback")
-async def submit_feedback(feedback: FeedbackRequest):
-    """Submit feedback for a specific run."""
+def _event_default(obj):
+    """Serialize LangChain objects embedded in stream events."""
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump()
+    return str(obj)
 
-    try:
-        langsmith_client.create_feedback(
-            run_id=feedback.run_id,
-            key="user_feedback",
-            score=feedback.score,
-            comment=feedback.comment,
+
+def _sse(event: dict) -> str:
+    """Format an event as a server-sent event."""
+    return f"data: {orjson.dumps(event, default=_event_default).decode()}\n\n"
+
+
+@app.post("/chat/stream")
+async def chat_stream(request: ChatRequest):
+    """Chat endpoint that streams agent events as server-sent events."""
+
+    async def event_stream():
+        events = agent_graph.astream_events(
+            {"messages": [HumanMessage(content=request.query)]},
+            {"metadata": {"user_query": request.query}},
+            version="v2",
         )
+        buffer = []
+        deadline = None  # when the oldest buffered event must be sent
+        pending = None
 
-        return {"status": "success", "message": "Feedback submitted"}
+        try:
+            while True:
+                if pending is None:
+                    pending = asyncio.ensure_future(anext(events))
 
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+                # Wait for the next event, but never past the flush deadline, so
+                # buffered events are not held back during a slow tool or LLM call
+                timeout = None
+                if deadline is not None:
+                    timeout = max(deadline - time.monotonic(), 0)
+                done, _ = await asyncio.wait({pending}, timeout=timeout)
+
+                if done:
+                    task, pending = pending, None
+                    try:
+                        event = task.result()
+                    except StopAsyncIteration:
+                        break
+                    buffer.append(_sse(event))
+                    if deadline is None:
+                        deadline = time.monotonic() + STREAM_FLUSH_INTERVAL
+
+                # Flush in small windows rather than one ASGI write per token
+                if deadline is not None and time.monotonic() >= deadline:
+                    yield "".join(buffer)
+                    buffer = []
+                    deadline = None
+
+        except Exception as e:
+            # Headers are already sent, so report the error in-band
+            buffer.append(_sse({"event": "error", "data": {"detail": str(e)}}))
+
+        finally:
+            # Stop the graph if the client went away mid-stream
+            if pending is not None:
+                pending.cancel()
+            else:
+                await events.aclose()
+
+        if buffer:
+            yield "".join(buffer)
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
+@app.post("/feedback", status_code=202)
+async def submit_feedback(feedback: FeedbackRequest):
+    """Queue feedback for a specific run."""
+
+    try:
+        feedback_queue.put_nowait(feedback)
+    except asyncio.QueueFull:
+        raise HTTPException(status_code=503, detail="Feedback queue is full")
+
+    return {"status": "accepted", "message": "Feedback queued"}
 
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # "auto" picks uvloop and httptools when installed (uvicorn[standard])
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="auto",
+        http="auto",
+        # Caches and Prometheus metrics are per process, so more workers
+        # split them; scale out with care
+        workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+    )
@@ -2,7 +2,10 @@
 
 import os
 import sys
+import logging
+from itertools import islice
 from pathlib import Path
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from datetime import datetime, timezone, timedelta
 from dotenv import load_dotenv
 from langchain_community.document_loaders import (
@@ -22,6 +25,13 @@ sys.path.append(str(Path(__file__).parent.parent))
 from src.vectorstore import create_collection_if_not_exists, add_documents_to_qdrant
 from src.tag_generator import generate_tags_batch
 
+# Shared by every file processed in this (worker) process
+_splitter = RecursiveCharacterTextSplitter(
+    chunk_size=1000,
+    chunk_overlap=200,
+    length_function=len,
+)
+
 
 def load_document(file_path: str):
     """Load a single document based on its extension."""
@@ -49,8 +59,55 @@ def load_document(file_path: str):
         return []
 
 
+def _process_file_worker(file_path: Path, root: Path) -> list[dict]:
+    """Load, split and tag a single file, returning its chunk documents."""
+
+    print(f"Processing: {file_path.name}")
+
+    # Load document
+    docs = load_document(str(file_path))
+    if not docs:
+        return []
+
+    # Combine all pages/sections into one text
+    full_text = "\n\n".join([doc.page_content for doc in docs])
+
+    # Split into chunks
+    chunks = _splitter.split_text(full_text)
+
+    print(f"  Created {len(chunks)} chunks")
+
+    # Generate tags for all chunks
+    print(f"  Generating tags...")
+    all_tags = generate_tags_batch(chunks)
+
+    # Create document structure for each chunk
+    file_name = file_path.name
+    file_ext = file_path.suffix.lower().replace(".", "")
+    source = file_path.relative_to(root).as_posix()
+    created = datetime.now(timezone(timedelta(hours=6))).isoformat()
+
+    documents = []
+    for i, (chunk, tags) in enumerate(zip(chunks, all_tags)):
+        doc = {
+            "text": chunk,
+            "file_name": file_name,
+            "file_ext": file_ext,
+            "tags": tags,
+            "chunk_id": i + 1,
+            "total_chunks": len(chunks),
+            "created": created,
+            "source": source,
+        }
+        documents.append(doc)
+
+    print(f"  ✓ Processed {file_name}\n")
+
+    return documents
+
+
 @traceable(name="ingest_documents", metadata={"operation": "document_ingestion"})
-def ingest_documents(directory_path: str = "data"):
+def ingest_documents(directory_path: str = "data", workers: int | None = None):
     """Ingest documents from a directory into Qdrant."""
 
     # Create collection if it doesn't exist
@@ -58,7 +115,7 @@ def ingest_documents(directory_path: str = "data"):
     create_collection_if_not_exists()
 
     # Supported file extensions
-    supported_extensions = [".pdf", ".docx", ".doc", ".md", ".txt"]
+    supported_extensions = {".pdf", ".docx", ".doc", ".md", ".txt"}
 
     # Find all supported files
     data_path = Path(directory_path)
@@ -66,9 +123,12 @@ def ingest_documents(directory_path: str = "data"):
         print(f"Directory {directory_path} does not exist!")
         return
 
-    all_files = []
-    for ext in supported_extensions:
-        all_files.extend(data_path.rglob(f"*{ext}"))
+    # Single walk over the tree, filtering by extension
+    all_files = [
+        path
+        for path in data_path.rglob("*")
+        if path.suffix.lower() in supported_extensions and path.is_file()
+    ]
 
     if not all_files:
         print(f"No supported files found in {directory_path}")
@@ -76,61 +136,43 @@ def ingest_documents(directory_path: str = "data"):
 
     print(f"Found {len(all_files)} files to process\n")
 
-    # Process each file
-    all_documents = []
-
-    for file_path in all_files:
-        print(f"Processing: {file_path.name}")
-
-        # Load document
-        docs = load_document(str(file_path))
-        if not docs:
-            continue
-
-        # Combine all pages/sections into one text
-        full_text = "\n\n".join([doc.page_content for doc in docs])
-
-        # Split into chunks
-        text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=1000,
-            chunk_overlap=200,
-            length_function=len,
-        )
-        chunks = text_splitter.split_text(full_text)
-
-        print(f"  Created {len(chunks)} chunks")
-
-        # Generate tags for all chunks
-        print(f"  Generating tags...")
-        all_tags = generate_tags_batch(chunks)
-
-        # Create document structure for each chunk
-        file_name = file_path.name
-        file_ext = file_path.suffix.lower().replace(".", "")
-        created = datetime.now(timezone(timedelta(hours=6))).isoformat()
-
-        for i, (chunk, tags) in enumerate(zip(chunks, all_tags)):
-            doc = {
-                "text": chunk,
-                "file_name": file_name,
-                "file_ext": file_ext,
-                "tags": tags,
-                "chunk_id": i + 1,
-                "total_chunks": len(chunks),
-                "created": created,
-            }
-            all_documents.append(doc)
-
-        print(f"  ✓ Processed {file_name}\n")
-
-    if not all_documents:
+    # Process files in parallel; uploading stays in this process
+    upload_batch_size = int(os.getenv("UPLOAD_BATCH_SIZE", "256"))
+    buffer = []
+    count = 0
+
+    # Keep only a few files in flight per worker so parsed results don't pile
+    # up while this process embeds and uploads
+    files = iter(all_files)
+    max_in_flight = 2 * (workers or os.cpu_count() or 1)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = {
+            executor.submit(_process_file_worker, path, data_path)
+            for path in islice(files, max_in_flight)
+        }
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                buffer.extend(future.result())
+            for path in islice(files, len(done)):
+                pending.add(executor.submit(_process_file_worker, path, data_path))
+
+            # Flush as we go so memory stays bounded by the batch size
+            if len(buffer) >= upload_batch_size:
+                print(f"Adding {len(buffer)} chunks to Qdrant...")
+                count += add_documents_to_qdrant(buffer)
+                buffer = []
+
+    if buffer:
+        print(f"Adding {len(buffer)} chunks to Qdrant...")
+        count += add_documents_to_qdrant(buffer)
+
+    if not count:
         print("No documents were processed successfully")
         return
 
-    # Add to Qdrant
-    print(f"Adding {len(all_documents)} chunks to Qdrant...")
-    count = add_documents_to_qdrant(all_documents)
-
     print(f"\n✓ Successfully ingested {count} document chunks into Qdrant")
     print(f"  Collection: {os.getenv('QDRANT_COLLECTION_NAME')}")
 
@@ -145,6 +187,19 @@ if __name__ == "__main__":
         default="data",
         help="Directory containing documents to ingest (default: data)",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count(),
+        help="Number of files to process in parallel (default: CPU count)",
+    )
 
     args = parser.parse_args()
-    ingest_documents(args.dir)
+    # Show this project's progress logs only; the root logger stays quiet so
+    # libraries such as httpx don't log every request
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("  %(message)s"))
+    project_logger = logging.getLogger("src")
+    project_logger.addHandler(handler)
+    project_logger.setLevel(logging.INFO)
+    ingest_documents(args.dir, args.workers)
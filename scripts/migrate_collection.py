@@ -0,0 +1,17 @@
+"""Script to apply storage, quantization and HNSW settings to an existing Qdrant collection."""
+
+import sys
+from pathlib import Path
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+from src.vectorstore import update_collection_config
+
+
+if __name__ == "__main__":
+    # Qdrant rebuilds the quantized vectors and HNSW index in the background
+    update_collection_config()
@@ -7,6 +7,21 @@ from src.agent_state import AgentState
 from src.agent_init import get_llm
 from src.tools import ALL_TOOLS
 
+# Built once and shared by every graph invocation
+_SYSTEM_MESSAGE = SystemMessage(
+    content="""You are a helpful AI assistant with access to a knowledge base.
+
+When users ask questions:
+1. Use the search_knowledge_base tool to find relevant information from documents
+2. Use the search_knowledge_base_batch tool when you need to look up several topics at once
+3. Use the stock_info tool when users ask about stock prices or market data
+4. Provide clear, accurate answers based on the retrieved context
+5. If the knowledge base doesn't contain relevant information, say so clearly
+6. Cite sources when providing information
+
+Be conversational and helpful."""
+)
+
 
 def create_agent_graph():
     """Create and compile the agent graph with tools."""
@@ -17,32 +32,16 @@ def create_agent_graph():
     # Bind tools to LLM
     llm_with_tools = llm.bind_tools(ALL_TOOLS)
 
-    # Define chat initialization node
-    def chat_init(state: AgentState) -> dict:
-        """Initialize chat with system message."""
-        messages = state["messages"]
-
-        # Add system message at the beginning
-        system_message = SystemMessage(
-            content="""You are a helpful AI assistant with access to a knowledge base.
-
-When users ask questions:
-1. Use the search_knowledge_base tool to find relevant information from documents
-2. Use the stock_info tool when users ask about stock prices or market data
-3. Provide clear, accurate answers based on the retrieved context
-4. If the knowledge base doesn't contain relevant information, say so clearly
-5. Cite sources when providing information
-
-Be conversational and helpful."""
-        )
-
-        return {"messages": [system_message] + messages}
-
     # Define agent node
-    def agent(state: AgentState) -> dict:
+    async def agent(state: AgentState) -> dict:
         """Agent node that decides whether to use tools or respond."""
         messages = state["messages"]
-        response = llm_with_tools.invoke(messages)
+
+        # Add system message at the beginning unless the caller supplied one
+        if not any(isinstance(m, SystemMessage) for m in messages):
+            messages = [_SYSTEM_MESSAGE, *messages]
+
+        response = await llm_with_tools.ainvoke(messages)
         return {"messages": [response]}
 
     # Create tool node
@@ -52,13 +51,11 @@ Be conversational and helpful."""
     workflow = StateGraph(AgentState)
 
     # Add nodes
-    workflow.add_node("chat_init", chat_init)
     workflow.add_node("agent", agent)
     workflow.add_node("tools", tool_node)
 
     # Add edges
-    workflow.add_edge(START, "chat_init")
-    workflow.add_edge("chat_init", "agent")
+    workflow.add_edge(START, "agent")
     workflow.add_conditional_edges(
         "agent",
         tools_condition,
@@ -1,24 +1,69 @@
 """Initialize LLM agent with OpenRouter configuration."""
 
 import os
+from contextlib import asynccontextmanager
+from functools import lru_cache
+import httpx
 from langchain_openai import ChatOpenAI
-from dotenv import load_dotenv
+from src.settings import require_env
 
-load_dotenv()
 
+# Read once at import; these do not change while the process runs
+_OPENROUTER_API_KEY = require_env("OPENROUTER_API_KEY")
+_OPENROUTER_BASE_URL = require_env("OPENROUTER_BASE_URL")
+_MODEL_NAME = require_env("MODEL_NAME")
+_TEMPERATURE = float(os.getenv("TEMPERATURE", "0.1"))
+_MAX_TOKENS = int(require_env("MAX_TOKENS"))
 
+# Connection pool shared by every request to OpenRouter
+_HTTP_LIMITS = httpx.Limits(max_keepalive_connections=32, max_connections=64)
+_HTTP_TIMEOUT = 30
+
+
+def _create_llm(**http_clients) -> ChatOpenAI:
+    """Create a ChatOpenAI instance with OpenRouter configuration."""
+    return ChatOpenAI(
+        openai_api_key=_OPENROUTER_API_KEY,
+        model=_MODEL_NAME,
+        temperature=_TEMPERATURE,
+        max_tokens=_MAX_TOKENS,
+        openai_api_base=_OPENROUTER_BASE_URL,
+        max_retries=3,
+        **http_clients,
+    )
+
+
+@lru_cache(maxsize=1)
 def get_llm() -> ChatOpenAI:
     """
     Initialize and return ChatOpenAI instance with OpenRouter configuration.
 
+    The instance is created once and reused so HTTP connections stay alive
+    across requests. Its async connections belong to the first event loop
+    that uses them, so only call it asynchronously from a long-lived loop
+    such as the API server's; use loop_local_llm under asyncio.run.
+
     Returns:
         Configured ChatOpenAI instance
     """
-    llm = ChatOpenAI(
-        openai_api_key=os.getenv("OPENROUTER_API_KEY"),
-        model=os.getenv("MODEL_NAME"),
-        temperature=float(os.getenv("TEMPERATURE")),
-        max_tokens=int(os.getenv("MAX_TOKENS")),
-        openai_api_base=os.getenv("OPENROUTER_BASE_URL"),
+    return _create_llm(
+        http_client=httpx.Client(limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT),
+        http_async_client=httpx.AsyncClient(
+            limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT
+        ),
     )
-    return llm
+
+
+@asynccontextmanager
+async def loop_local_llm():
+    """
+    Yield a ChatOpenAI instance whose connection pool lives on the running loop.
+
+    The pool is closed on exit, before the loop goes away, so callers that run
+    a fresh event loop per call (e.g. with asyncio.run) never reuse
+    connections from a closed one.
+    """
+    async with httpx.AsyncClient(
+        limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT
+    ) as http_async_client:
+        yield _create_llm(http_async_client=http_async_client)
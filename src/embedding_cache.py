@@ -0,0 +1,136 @@
+"""Persistent cache of embedding vectors keyed by content hash."""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+import numpy as np
+
+# SQLite limits the number of bound parameters per statement
+_MAX_PARAMS = 500
+
+# Rows kept before the least recently used are evicted (~12 KB each at 3072 dims)
+DEFAULT_MAX_ROWS = 100_000
+
+# Seconds before a read refreshes a row's last-used time; coarse LRU order
+# spares most cache hits a write transaction
+_TOUCH_INTERVAL = 3600
+
+# Rows written by this process between size checks; the table can overshoot
+# the cap by up to this much per writer
+_EVICT_CHECK_INTERVAL = 1000
+
+
+class EmbeddingCache:
+    """SQLite-backed LRU store of float32 embedding vectors keyed by SHA-256."""
+
+    def __init__(self, path: str, max_rows: int = DEFAULT_MAX_ROWS):
+        self.max_rows = max_rows
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._writes_since_check = 0
+
+        with self._lock:
+            # WAL lets ingestion and the API server share the file
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS emb (key BLOB PRIMARY KEY, vec BLOB NOT NULL)"
+            )
+
+            # used: last read or write time, for LRU eviction; added in place
+            # to cache files created before eviction existed
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(emb)")}
+            if "used" not in columns:
+                self._conn.execute(
+                    "ALTER TABLE emb ADD COLUMN used REAL NOT NULL DEFAULT 0"
+                )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS emb_used ON emb (used)")
+            self._conn.commit()
+
+            self._evict()
+
+    @staticmethod
+    def key(model: str, text: str) -> bytes:
+        """Build the cache key for a text embedded with a given model."""
+        return hashlib.sha256(f"{model}\0{text}".encode()).digest()
+
+    def get_many(self, keys: list[bytes]) -> dict[bytes, np.ndarray]:
+        """
+        Look up cached vectors, marking stale found ones as recently used.
+
+        Args:
+            keys: Cache keys from EmbeddingCache.key
+
+        Returns:
+            Mapping of found keys to float32 vectors; missing keys are omitted
+        """
+        found = {}
+        now = time.time()
+        stale = []
+
+        with self._lock:
+            for i in range(0, len(keys), _MAX_PARAMS):
+                batch = keys[i : i + _MAX_PARAMS]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key, vec, used FROM emb WHERE key IN ({placeholders})",
+                    batch,
+                )
+                for key, vec, used in rows:
+                    found[key] = np.frombuffer(vec, dtype=np.float32)
+                    if now - used >= _TOUCH_INTERVAL:
+                        stale.append((now, key))
+
+            if stale:
+                self._conn.executemany("UPDATE emb SET used = ? WHERE key = ?", stale)
+                self._conn.commit()
+
+        return found
+
+    def put_many(self, items: list[tuple[bytes, list[float]]]):
+        """Store (key, vector) pairs as float32 bytes, evicting old rows if full."""
+        if not items:
+            return
+
+        now = time.time()
+        rows = [
+            (key, np.asarray(vector, dtype=np.float32).tobytes(), now)
+            for key, vector in items
+        ]
+
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO emb (key, vec, used) VALUES (?, ?, ?)", rows
+            )
+            self._conn.commit()
+
+            self._writes_since_check += len(rows)
+            if self._writes_since_check >= _EVICT_CHECK_INTERVAL:
+                self._evict()
+
+    def _evict(self):
+        """Delete the least recently used rows beyond max_rows; caller holds lock."""
+        self._writes_since_check = 0
+
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM emb").fetchone()
+        excess = count - self.max_rows
+        if excess <= 0:
+            return
+
+        self._conn.execute(
+            "DELETE FROM emb WHERE key IN (SELECT key FROM emb ORDER BY used LIMIT ?)",
+            (excess,),
+        )
+        self._conn.commit()
+
+
+@lru_cache(maxsize=1)
+def get_embedding_cache() -> EmbeddingCache | None:
+    """Get the shared embedding cache, or None if EMBEDDING_CACHE_PATH is unset."""
+    path = os.getenv("EMBEDDING_CACHE_PATH")
+    if not path:
+        return None
+    max_rows = int(os.getenv("EMBEDDING_CACHE_MAX_ROWS", str(DEFAULT_MAX_ROWS)))
+    return EmbeddingCache(path, max_rows)
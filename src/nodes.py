@@ -1,3 +1,4 @@
+from functools import lru_cache
 from langchain_core.messages import HumanMessage, SystemMessage
 from langsmith import traceable
 from src.state import State
@@ -5,22 +6,35 @@ from src.vectorstore import search_documents
 from src.agent_init import get_llm
 import os
 
+# Kept byte-identical across requests so provider prompt caching can reuse it
+_SYSTEM_MESSAGE = SystemMessage(
+    content="You are a helpful assistant that answers questions based on the provided context. If the context doesn't contain relevant information, say so."
+)
+
+
+@lru_cache(maxsize=256)
+def _format_context(retrieved_docs: tuple[str, ...]) -> str:
+    """Format retrieved documents into a numbered context block."""
+    return "\n\n".join(
+        [f"Document {i+1}:\n{doc}" for i, doc in enumerate(retrieved_docs)]
+    )
+
 
 @traceable(name="retrieve_documents")
-def retrieve_documents(state: State) -> dict:
+async def retrieve_documents(state: State) -> dict:
     """Retrieve relevant documents from Qdrant."""
 
     query = state["query"]
 
     # Retrieve top 3 relevant documents
-    docs = search_documents(query, limit=3)
+    docs = await search_documents(query, limit=3)
     retrieved_docs = [doc["text"] for doc in docs]
 
     return {"retrieved_docs": retrieved_docs}
 
 
 @traceable(name="generate_answer", metadata={"model": os.getenv("MODEL_NAME")})
-def generate_answer(state: State) -> dict:
+async def generate_answer(state: State) -> dict:
     """Generate answer using retrieved documents and LLM."""
 
     query = state["query"]
@@ -30,20 +44,16 @@ def generate_answer(state: State) -> dict:
     llm = get_llm()
 
     # Format context from retrieved documents
-    context = "\n\n".join(
-        [f"Document {i+1}:\n{doc}" for i, doc in enumerate(retrieved_docs)]
-    )
+    context = _format_context(tuple(retrieved_docs))
 
-    # Create prompt
+    # Create prompt; the stable parts come first and the query last
     messages = [
-        SystemMessage(
-            content="You are a helpful assistant that answers questions based on the provided context. If the context doesn't contain relevant information, say so."
-        ),
+        _SYSTEM_MESSAGE,
         HumanMessage(content=f"Context:\n{context}\n\nQuestion: {query}\n\nAnswer:"),
     ]
 
     # Generate response
-    response = llm.invoke(messages)
+    response = await llm.ainvoke(messages)
 
     return {
         "answer": response.content,
@@ -0,0 +1,156 @@
+"""
+In-memory cache for knowledge base search results.
+
+Each API worker process keeps its own cache, and ingestion runs in a separate
+process, so newly ingested documents can take up to CACHE_TTL seconds to show
+up in results for queries that are already cached.
+"""
+
+import re
+import threading
+import time
+import numpy as np
+from cachetools import TTLCache
+from prometheus_client import Counter
+
+# Exact-match tier: (query, limit) -> documents
+EXACT_CACHE_SIZE = 2000
+CACHE_TTL = 600
+
+# Semantic tier: near-duplicate query embeddings -> documents
+SEMANTIC_CACHE_SIZE = 256
+SEMANTIC_MIN_SIMILARITY = 0.97
+EMBEDDING_DIM = 3072
+
+# Hit rate signals for tuning the sizes and TTL above
+CACHE_HITS = Counter("cache_hits_total", "Search cache hits", ["tier"])
+CACHE_MISSES = Counter("cache_misses_total", "Search cache misses (both tiers)")
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+class ProximityCache:
+    """
+    Fixed-capacity cache mapping query embeddings to search results.
+
+    Embeddings are stored L2-normalized in one (capacity, dim) float32 matrix,
+    so a lookup is a single matrix-vector product. When full, the least
+    recently used entry is evicted. Not thread-safe; callers hold a lock.
+    """
+
+    def __init__(
+        self,
+        capacity: int = SEMANTIC_CACHE_SIZE,
+        dim: int = EMBEDDING_DIM,
+        min_similarity: float = SEMANTIC_MIN_SIMILARITY,
+        ttl: float = CACHE_TTL,
+    ):
+        self.capacity = capacity
+        self.min_similarity = min_similarity
+        self.ttl = ttl
+
+        self._keys = np.zeros((capacity, dim), dtype=np.float32)
+        self._limits = np.zeros(capacity, dtype=np.int32)
+        self._expires = np.zeros(capacity, dtype=np.float64)
+        self._last_used = np.zeros(capacity, dtype=np.int64)
+        self._results: list = [None] * capacity
+        self._size = 0
+        self._clock = 0
+
+    @staticmethod
+    def _unit(vector: list[float]) -> np.ndarray:
+        """L2-normalize an embedding so cosine similarity is a dot product."""
+        vec = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm else vec
+
+    def _touch(self, slot: int):
+        """Mark a slot as most recently used."""
+        self._clock += 1
+        self._last_used[slot] = self._clock
+
+    def get(self, vector: list[float], limit: int) -> list[dict] | None:
+        """Return results for the most similar fresh entry above the threshold."""
+        if not self._size:
+            return None
+
+        sims = self._keys[: self._size] @ self._unit(vector)
+        valid = (self._limits[: self._size] == limit) & (
+            self._expires[: self._size] > time.monotonic()
+        )
+        sims = np.where(valid, sims, -1.0)
+
+        best = int(np.argmax(sims))
+        if sims[best] < self.min_similarity:
+            return None
+
+        self._touch(best)
+        return self._results[best]
+
+    def put(self, vector: list[float], limit: int, documents: list[dict]):
+        """Store results, evicting the least recently used entry if full."""
+        if self._size < self.capacity:
+            slot = self._size
+            self._size += 1
+        else:
+            slot = int(np.argmin(self._last_used))
+
+        self._keys[slot] = self._unit(vector)
+        self._limits[slot] = limit
+        self._expires[slot] = time.monotonic() + self.ttl
+        self._results[slot] = documents
+        self._touch(slot)
+
+
+_lock = threading.Lock()
+_exact = TTLCache(maxsize=EXACT_CACHE_SIZE, ttl=CACHE_TTL)
+_proximity = ProximityCache()
+
+
+def _normalize(query: str) -> str:
+    """Normalize case, whitespace and trailing punctuation of a query."""
+    return _WHITESPACE.sub(" ", query.lower()).strip().rstrip("?.! ")
+
+
+def _key(query: str, limit: int) -> tuple:
+    """Build the exact-match cache key for a query."""
+    return (_normalize(query), limit)
+
+
+def get(query: str, limit: int) -> list[dict] | None:
+    """Return cached documents for an identical (normalized) query, if any."""
+    with _lock:
+        documents = _exact.get(_key(query, limit))
+
+    if documents is not None:
+        CACHE_HITS.labels(tier="exact").inc()
+    return documents
+
+
+def get_similar(query_vector: list[float], limit: int) -> list[dict] | None:
+    """
+    Return cached documents for a semantically near-identical query.
+
+    Args:
+        query_vector: Embedding of the incoming query
+        limit: Number of documents requested
+
+    Returns:
+        Cached documents if a stored query has cosine similarity of at least
+        SEMANTIC_MIN_SIMILARITY, otherwise None
+    """
+    with _lock:
+        documents = _proximity.get(query_vector, limit)
+
+    if documents is not None:
+        CACHE_HITS.labels(tier="semantic").inc()
+    else:
+        CACHE_MISSES.inc()
+    return documents
+
+
+def put(query: str, limit: int, query_vector: list[float], documents: list[dict]):
+    """Store search results in both cache tiers."""
+    with _lock:
+        _exact[_key(query, limit)] = documents
+        _proximity.put(query_vector, limit, documents)
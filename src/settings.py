@@ -0,0 +1,14 @@
+"""Environment loading shared by the API server and scripts."""
+
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def require_env(name: str) -> str:
+    """Return a required environment variable, failing fast if it is unset."""
+    value = os.getenv(name)
+    if not value:
+        raise RuntimeError(f"Missing required environment variable: {name}")
+    return value
@@ -1,24 +1,19 @@
 """Generate tags for document chunks using LLM."""
 
+import asyncio
 from langchain_core.messages import SystemMessage, HumanMessage
-from src.agent_init import get_llm
+from langchain_openai import ChatOpenAI
+from src.agent_init import get_llm, loop_local_llm
 
+# Maximum number of concurrent tagging requests to OpenRouter
+MAX_CONCURRENT_REQUESTS = 16
 
-def generate_tags(text: str) -> list[str]:
-    """
-    Generate 3 relevant tags for a text chunk using LLM.
+DEFAULT_TAGS = ["general", "document", "content"]
 
-    Args:
-        text: The text chunk to generate tags for
-
-    Returns:
-        List of 3 tags
-    """
-    # Initialize LLM with OpenRouter
-    llm = get_llm()
 
-    # Create prompt
-    messages = [
+def _build_messages(text: str) -> list:
+    """Build the tagging prompt for a text chunk."""
+    return [
         SystemMessage(
             content="""You are a tagging assistant. Generate exactly 3 relevant, concise tags for the given text.
 Tags should be:
@@ -33,46 +28,113 @@ Example: machine learning, python, data science"""
         HumanMessage(content=f"Generate 3 tags for this text:\n\n{text[:500]}"),
     ]
 
-    try:
-        # Generate tags
-        response = llm.invoke(messages)
-        tags_text = response.content.strip()
 
-        # Parse tags
-        tags = [tag.strip() for tag in tags_text.split(",")]
+def _parse_tags(tags_text: str) -> list[str]:
+    """Parse a comma-separated LLM response into exactly 3 tags."""
+    tags = [tag.strip() for tag in tags_text.strip().split(",")]
+
+    # Ensure we have exactly 3 tags
+    if len(tags) < 3:
+        tags.extend(["general"] * (3 - len(tags)))
+    elif len(tags) > 3:
+        tags = tags[:3]
 
-        # Ensure we have exactly 3 tags
-        if len(tags) < 3:
-            tags.extend(["general"] * (3 - len(tags)))
-        elif len(tags) > 3:
-            tags = tags[:3]
+    return tags
 
-        return tags
+
+def generate_tags(text: str) -> list[str]:
+    """
+    Generate 3 relevant tags for a text chunk using LLM.
+
+    Args:
+        text: The text chunk to generate tags for
+
+    Returns:
+        List of 3 tags
+    """
+    # Initialize LLM with OpenRouter
+    llm = get_llm()
+
+    try:
+        # Generate tags
+        response = llm.invoke(_build_messages(text))
+        return _parse_tags(response.content)
 
     except Exception as e:
         print(f"Error generating tags: {e}")
-        return ["general", "document", "content"]
+        return list(DEFAULT_TAGS)
+
+
+async def agenerate_tags(
+    text: str, semaphore: asyncio.Semaphore, llm: ChatOpenAI | None = None
+) -> list[str]:
+    """
+    Generate 3 relevant tags for a text chunk without blocking the event loop.
+
+    Args:
+        text: The text chunk to generate tags for
+        semaphore: Limits the number of in-flight requests
+        llm: LLM bound to the running loop (default: the shared get_llm())
+
+    Returns:
+        List of 3 tags
+    """
+    llm = llm or get_llm()
 
+    async with semaphore:
+        try:
+            response = await llm.ainvoke(_build_messages(text))
+            return _parse_tags(response.content)
 
-def generate_tags_batch(texts: list[str], batch_size: int = 10) -> list[list[str]]:
+        except Exception as e:
+            print(f"Error generating tags: {e}")
+            return list(DEFAULT_TAGS)
+
+
+async def _generate_tags_concurrently(
+    texts: list[str], batch_size: int, max_concurrency: int
+) -> list[list[str]]:
+    """Tag all chunks with up to max_concurrency requests in flight."""
+    semaphore = asyncio.Semaphore(max_concurrency)
+    all_tags = []
+
+    # Each generate_tags_batch call runs its own event loop, so the shared
+    # get_llm() connections cannot be reused here
+    async with loop_local_llm() as llm:
+        for i in range(0, len(texts), batch_size):
+            batch = texts[i : i + batch_size]
+            print(
+                f"Generating tags for chunks {i+1}-{min(i+batch_size, len(texts))}..."
+            )
+
+            # gather preserves input order
+            tags = await asyncio.gather(
+                *(agenerate_tags(t, semaphore, llm) for t in batch)
+            )
+            all_tags.extend(tags)
+
+    return all_tags
+
+
+def generate_tags_batch(
+    texts: list[str],
+    batch_size: int = 64,
+    max_concurrency: int = MAX_CONCURRENT_REQUESTS,
+) -> list[list[str]]:
     """
     Generate tags for multiple text chunks in batches.
 
+    Chunks within a batch are tagged concurrently.
+
     Args:
         texts: List of text chunks
         batch_size: Number of texts to process at once
+        max_concurrency: Maximum number of concurrent LLM requests
 
     Returns:
         List of tag lists
     """
-    all_tags = []
+    if not texts:
+        return []
 
-    for i in range(0, len(texts), batch_size):
-        batch = texts[i : i + batch_size]
-        print(f"Generating tags for chunks {i+1}-{min(i+batch_size, len(texts))}...")
-
-        for text in batch:
-            tags = generate_tags(text)
-            all_tags.append(tags)
-
-    return all_tags
+    return asyncio.run(_generate_tags_concurrently(texts, batch_size, max_concurrency))
@@ -1,11 +1,12 @@
 """Tools for the agent."""
 
-from src.tools.rag_tool import search_knowledge_base
+from src.tools.rag_tool import search_knowledge_base, search_knowledge_base_batch
 from src.tools.stock_tool import stock_info
 
 # List of all available tools
 ALL_TOOLS = [
     search_knowledge_base,
+    search_knowledge_base_batch,
     stock_info,
 ]
 
@@ -1,11 +1,25 @@
 """RAG tool for retrieving and answering questions from documents."""
 
 from langchain_core.tools import tool
-from src.vectorstore import search_documents
+from src.vectorstore import search_documents, search_documents_batch
+
+
+def _format_context(docs: list[dict]) -> str:
+    """Format retrieved documents as numbered, attributed sources."""
+    if not docs:
+        return "No relevant information found in the knowledge base."
+
+    context_parts = []
+    for i, doc in enumerate(docs, 1):
+        context_parts.append(
+            f"[Source {i}] (from {doc['file_name']}, tags: {', '.join(doc['tags'])})\n{doc['text']}"
+        )
+
+    return "\n\n---\n\n".join(context_parts)
 
 
 @tool
-def search_knowledge_base(query: str) -> str:
+async def search_knowledge_base(query: str) -> str:
     """
     Search the knowledge base for relevant information and return context.
 
@@ -18,16 +32,33 @@ def search_knowledge_base(query: str) -> str:
         Relevant context from the knowledge base
     """
     # Retrieve relevant documents
-    docs = search_documents(query, limit=3)
-
-    if not docs:
-        return "No relevant information found in the knowledge base."
+    docs = await search_documents(query, limit=3)
 
     # Format context
-    context_parts = []
-    for i, doc in enumerate(docs, 1):
-        context_parts.append(
-            f"[Source {i}] (from {doc['file_name']}, tags: {', '.join(doc['tags'])})\n{doc['text']}"
-        )
+    return _format_context(docs)
 
-    return "\n\n---\n\n".join(context_parts)
+
+@tool
+async def search_knowledge_base_batch(queries: list[str]) -> str:
+    """
+    Search the knowledge base for several queries at once and return context.
+
+    Use this tool instead of calling search_knowledge_base repeatedly when a
+    question needs information on multiple distinct topics.
+
+    Args:
+        queries: The search queries or questions to find relevant information for
+
+    Returns:
+        Relevant context from the knowledge base, grouped by query
+    """
+    # Retrieve relevant documents for all queries in one round-trip
+    results = await search_documents_batch(queries, limit=3)
+
+    # Format context per query
+    sections = [
+        f"Results for: {query}\n\n{_format_context(docs)}"
+        for query, docs in zip(queries, results)
+    ]
+
+    return "\n\n===\n\n".join(sections)
@@ -1,13 +1,62 @@
 """Stock market data tool using Alpha Vantage API."""
 
 import os
-import requests
+import time
+import httpx
+import orjson
+from itertools import islice
 from typing import Literal, Optional
+from cachetools import TLRUCache
 from langchain_core.tools import tool
 
+# Optional; stock_info reports a clear error when it is missing
+_STOCK_API_KEY = os.getenv("STOCK_API_KEY")
+
+# Shared client so repeated calls reuse keep-alive connections; HTTP/2 lets
+# concurrent tool calls (e.g. several symbols) share one connection
+_client = httpx.AsyncClient(
+    base_url="https://www.alphavantage.co",
+    timeout=10,
+    http2=True,
+    limits=httpx.Limits(max_keepalive_connections=10),
+)
+
+# Seconds to cache a response, by function; slower-moving series live longer
+_CACHE_TTLS = {
+    "TIME_SERIES_INTRADAY": 60,
+    "GLOBAL_QUOTE": 60,
+    "TIME_SERIES_DAILY": 3600,
+    "TIME_SERIES_DAILY_ADJUSTED": 3600,
+}
+_DEFAULT_CACHE_TTL = 86400  # weekly and monthly series
+
+
+def _cache_ttu(key: tuple, value: dict, now: float) -> float:
+    """Return the expiry time for a cached response keyed by function."""
+    return now + _CACHE_TTLS.get(key[1], _DEFAULT_CACHE_TTL)
+
+
+# Response key holding the data for each function; the intraday key depends on
+# the interval, e.g. "Time Series (5min)"
+_DATA_KEYS = {
+    "TIME_SERIES_DAILY": "Time Series (Daily)",
+    "TIME_SERIES_DAILY_ADJUSTED": "Time Series (Daily)",
+    "TIME_SERIES_WEEKLY": "Weekly Time Series",
+    "TIME_SERIES_WEEKLY_ADJUSTED": "Weekly Adjusted Time Series",
+    "TIME_SERIES_MONTHLY": "Monthly Time Series",
+    "TIME_SERIES_MONTHLY_ADJUSTED": "Monthly Adjusted Time Series",
+    "GLOBAL_QUOTE": "Global Quote",
+}
+_META_KEY = "Meta Data"
+_MAX_DATA_POINTS = 5
+
+
+# Parsed API responses keyed by (symbol, function, interval, outputsize)
+_cache = TLRUCache(maxsize=1024, ttu=_cache_ttu, timer=time.monotonic)
+
 
 @tool
-def stock_info(
+async def stock_info(
     symbol: str,
     function: Literal[
         "TIME_SERIES_INTRADAY",
@@ -37,7 +86,7 @@ def stock_info(
     Returns:
         Formatted stock data including prices, volumes, and changes
     """
-    api_key = os.getenv("STOCK_API_KEY")
+    api_key = _STOCK_API_KEY
 
     if not api_key:
         return "Error: STOCK_API_KEY environment variable not set"
@@ -59,35 +108,65 @@ def stock_info(
     elif function != "GLOBAL_QUOTE":
         params["outputsize"] = outputsize
 
-    try:
-        response = requests.get(
-            "https://www.alphavantage.co/query", params=params, timeout=30
-        )
-        response.raise_for_status()
-        data = response.json()
+    # Serve repeated requests from cache to stay within the API rate limit
+    cache_key = (
+        symbol.upper(),
+        function,
+        params.get("interval"),
+        params.get("outputsize"),
+    )
+    data = _cache.get(cache_key)
 
-        # Check for errors
-        if "Error Message" in data:
-            return f"Error: {data['Error Message']}"
-        if "Note" in data:
-            return f"API Limit: {data['Note']}"
+    try:
+        if data is None:
+            response = await _client.get("/query", params=params)
+            response.raise_for_status()
+            data = orjson.loads(response.content)
+
+            # Check for errors; rate-limit and premium replies use "Note" or
+            # "Information"
+            if "Error Message" in data:
+                return f"Error: {data['Error Message']}"
+            for key in ("Note", "Information"):
+                if key in data:
+                    return f"API Limit: {data[key]}"
+
+            # Only cache real data, never an unexpected non-data reply
+            if _data_key(data, function, interval):
+                _cache[cache_key] = data
 
         # Format response
-        return _format_stock_data(data, function)
+        return _format_stock_data(data, function, interval)
 
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         return f"API Request Error: {str(e)}"
     except Exception as e:
         return f"Error: {str(e)}"
 
 
-def _format_stock_data(data: dict, function: str) -> str:
+async def close_client():
+    """Close the shared Alpha Vantage HTTP client."""
+    await _client.aclose()
+
+
+def _data_key(data: dict, function: str, interval: Optional[str]) -> Optional[str]:
+    """Return the response key holding the data, or None if there is none."""
+    # Look up the data key directly; scan only if the API renamed it
+    if function == "TIME_SERIES_INTRADAY":
+        ts_key = f"Time Series ({interval})"
+    else:
+        ts_key = _DATA_KEYS.get(function)
+
+    if ts_key in data:
+        return ts_key
+    return next((k for k in data if "Time Series" in k or "Global Quote" in k), None)
+
+
+def _format_stock_data(
+    data: dict, function: str, interval: Optional[str] = None
+) -> str:
     """Format stock data for readability."""
-    # Find the data keys
-    meta_key = next((k for k in data.keys() if "Meta Data" in k), None)
-    ts_key = next(
-        (k for k in data.keys() if "Time Series" in k or "Global Quote" in k), None
-    )
+    ts_key = _data_key(data, function, interval)
 
     if not ts_key:
         return str(data)
@@ -110,20 +189,20 @@ def _format_stock_data(data: dict, function: str) -> str:
         return result
 
     # Format time series data
-    metadata = data.get(meta_key, {})
+    metadata = data.get(_META_KEY, {})
     result = f"**{metadata.get('2. Symbol', 'N/A')} Stock Data**\n\n"
     result += f"Last Refreshed: {metadata.get('3. Last Refreshed', 'N/A')}\n\n"
 
-    # Show latest 5 data points
-    items = list(time_series.items())[:5]
+    # Show latest data points without copying the whole series
     result += "Latest Data:\n"
-    for timestamp, values in items:
+    for timestamp, values in islice(time_series.items(), _MAX_DATA_POINTS):
         result += f"\n{timestamp}:\n"
         for key, value in values.items():
             clean_key = key.split(". ", 1)[-1] if ". " in key else key
             result += f"  {clean_key}: {value}\n"
 
-    if len(time_series) > 5:
-        result += f"\n... and {len(time_series) - 5} more data points available"
+    if len(time_series) > _MAX_DATA_POINTS:
+        remaining = len(time_series) - _MAX_DATA_POINTS
+        result += f"\n... and {remaining} more data points available"
 
     return result
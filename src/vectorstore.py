@@ -1,188 +1,278 @@
 import os
-import time
-import json
-import tempfile
+import uuid
+import asyncio
+import logging
+import sqlite3
 from datetime import datetime
-from qdrant_client import QdrantClient
-from qdrant_client.models import Distance, VectorParams, PointStruct
-from langchain_openai import OpenAIEmbeddings
-from openai import OpenAI
+from functools import lru_cache
+import numpy as np
+from qdrant_client import AsyncQdrantClient, QdrantClient
+from qdrant_client.models import (
+    Distance,
+    HnswConfigDiff,
+    QuantizationSearchParams,
+    QueryRequest,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    SearchParams,
+    VectorParams,
+    VectorParamsDiff,
+)
+from openai import AsyncOpenAI
+from src import query_cache
+from src.embedding_cache import EmbeddingCache, get_embedding_cache
+from src.settings import require_env
+
+logger = logging.getLogger(__name__)
+
+# Read once at import; these do not change while the process runs
+_QDRANT_URL = os.getenv("QDRANT_URL")
+_QDRANT_API_KEY = os.getenv("QDRANT_API_KEY")
+_QDRANT_GRPC_PORT = int(os.getenv("QDRANT_GRPC_PORT", "6334"))
+_COLLECTION_NAME = require_env("QDRANT_COLLECTION_NAME")
+_OPENAI_API_KEY = require_env("OPENAI_API_KEY")
+
+EMBEDDING_MODEL = "text-embedding-3-large"
+
+# Fields stored in each point's payload
+PAYLOAD_KEYS = (
+    "text",
+    "file_name",
+    "file_ext",
+    "tags",
+    "chunk_id",
+    "total_chunks",
+    "created",
+)
+
+# Namespace for content-derived point IDs
+POINT_ID_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "langgraph-rag/points")
+
+# Texts per embeddings request; the API accepts up to 2048 inputs but also caps
+# total tokens per request, which 2048 chunks of 1000 characters would exceed
+EMBEDDING_BATCH_SIZE = 512
+MAX_CONCURRENT_EMBEDDING_REQUESTS = 8
+
+# Points per upload request (~1.5 MB of float32 vectors)
+QDRANT_UPLOAD_BATCH_SIZE = 128
+
+# int8 copies of the vectors kept in RAM; the original float32 vectors (and
+# the HNSW graph) live on disk and are only read to rescore candidates
+QUANTIZATION_CONFIG = ScalarQuantization(
+    scalar=ScalarQuantizationConfig(
+        type=ScalarType.INT8, quantile=0.99, always_ram=True
+    )
+)
+HNSW_CONFIG = HnswConfigDiff(m=16, ef_construct=128, on_disk=True)
+SEARCH_PARAMS = SearchParams(
+    hnsw_ef=64,
+    quantization=QuantizationSearchParams(rescore=True, oversampling=2.0),
+)
 
 
+@lru_cache(maxsize=1)
 def get_qdrant_client():
-    """Get Qdrant client instance."""
+    """Get the shared Qdrant client instance (gRPC transport)."""
     return QdrantClient(
-        url=os.getenv("QDRANT_URL"),
-        api_key=os.getenv("QDRANT_API_KEY"),
+        url=_QDRANT_URL,
+        api_key=_QDRANT_API_KEY,
+        prefer_grpc=True,
+        grpc_port=_QDRANT_GRPC_PORT,
     )
 
 
-def get_embeddings():
-    """Get OpenAI embeddings instance."""
-    return OpenAIEmbeddings(
-        model="text-embedding-3-large",
-        openai_api_key=os.getenv("OPENAI_API_KEY"),
+@lru_cache(maxsize=1)
+def get_async_qdrant_client():
+    """Get the shared async Qdrant client instance (gRPC transport)."""
+    return AsyncQdrantClient(
+        url=_QDRANT_URL,
+        api_key=_QDRANT_API_KEY,
+        prefer_grpc=True,
+        grpc_port=_QDRANT_GRPC_PORT,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_openai_client():
+    """Get the shared async OpenAI client used to embed search queries."""
+    return AsyncOpenAI(api_key=_OPENAI_API_KEY, max_retries=3)
+
+
+async def close_clients():
+    """Close the shared async Qdrant and OpenAI clients, if they were created."""
+    if get_async_qdrant_client.cache_info().currsize:
+        await get_async_qdrant_client().close()
+        get_async_qdrant_client.cache_clear()
+    if get_openai_client.cache_info().currsize:
+        await get_openai_client().close()
+        get_openai_client.cache_clear()
+
+
+async def embed_queries(texts: list[str]) -> list[list[float]]:
+    """Embed search queries in one request, preserving input order."""
+    response = await get_openai_client().embeddings.create(
+        model=EMBEDDING_MODEL, input=texts
     )
+    return [item.embedding for item in response.data]
 
 
 def create_collection_if_not_exists():
     """Create Qdrant collection if it doesn't exist."""
     client = get_qdrant_client()
-    collection_name = os.getenv("QDRANT_COLLECTION_NAME")
+    collection_name = _COLLECTION_NAME
 
     collections = client.get_collections().collections
     if not any(col.name == collection_name for col in collections):
         client.create_collection(
             collection_name=collection_name,
-            vectors_config=VectorParams(size=3072, distance=Distance.COSINE),
+            vectors_config=VectorParams(
+                size=3072, distance=Distance.COSINE, on_disk=True
+            ),
+            quantization_config=QUANTIZATION_CONFIG,
+            hnsw_config=HNSW_CONFIG,
         )
         print(f"Created collection: {collection_name}")
 
 
-def generate_embeddings_batch(
-    texts: list[str], model: str = "text-embedding-3-large"
+def update_collection_config():
+    """Apply the current storage, quantization and HNSW settings to an existing collection."""
+    client = get_qdrant_client()
+    collection_name = _COLLECTION_NAME
+
+    client.update_collection(
+        collection_name=collection_name,
+        vectors_config={"": VectorParamsDiff(on_disk=True)},
+        quantization_config=QUANTIZATION_CONFIG,
+        hnsw_config=HNSW_CONFIG,
+    )
+    print(f"Updated collection: {collection_name}")
+
+
+async def _embed_async(texts: list[str], model: str) -> list[list[float]]:
+    """Embed texts in concurrent bulk requests, preserving input order."""
+    # Created per call: it is bound to the event loop that asyncio.run creates.
+    # The client retries 429s and 5xx responses with exponential backoff
+    openai_client = AsyncOpenAI(api_key=_OPENAI_API_KEY, max_retries=5)
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_EMBEDDING_REQUESTS)
+
+    async def embed(batch: list[str]) -> list[list[float]]:
+        async with semaphore:
+            response = await openai_client.embeddings.create(model=model, input=batch)
+
+        # Response data is in the same order as the inputs
+        return [item.embedding for item in response.data]
+
+    try:
+        batches = await asyncio.gather(
+            *(
+                embed(texts[i : i + EMBEDDING_BATCH_SIZE])
+                for i in range(0, len(texts), EMBEDDING_BATCH_SIZE)
+            )
+        )
+    finally:
+        await openai_client.close()
+
+    return [vector for batch in batches for vector in batch]
+
+
+# Background embedding cache writes, referenced until they finish
+_pending_cache_writes: set[asyncio.Future] = set()
+
+
+def _cache_write_done(write: asyncio.Future):
+    """Log a failed embedding cache write; the cache is best-effort."""
+    _pending_cache_writes.discard(write)
+    if not write.cancelled() and write.exception() is not None:
+        logger.warning("Could not write to the embedding cache: %s", write.exception())
+
+
+async def _embed_cached(
+    texts: list[str], model: str, embed, wait_for_write: bool = True
 ) -> list[list[float]]:
     """
-    Generate embeddings using OpenAI's batch API for efficiency.
+    Embed texts, serving previously seen texts from the embedding cache.
 
     Args:
         texts: List of text strings to embed
-        model: OpenAI embedding model to use
+        model: Embedding model, part of the cache key
+        embed: Coroutine function embedding a list of texts in order
+        wait_for_write: Wait for new vectors to be stored; when False they are
+            written in the background, so a busy cache file cannot delay the
+            caller (used on the search path)
 
     Returns:
         List of embedding vectors in the same order as input texts
     """
-    if not texts:
-        return []
-
-    # For small batches, use regular API
-    if len(texts) <= 5:
-        print(f"  Using standard API for {len(texts)} embeddings (small batch)...")
-        embeddings = get_embeddings()
-        vectors = embeddings.embed_documents(texts)
-        print(f"  ✓ Standard embeddings completed")
-        return vectors
-
-    print(f"\n{'='*60}")
-    print(f"BATCH EMBEDDING PROCESS")
-    print(f"{'='*60}")
-    print(f"Total texts to embed: {len(texts)}")
-    print(f"Model: {model}")
-
-    openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-
-    # Create temporary JSONL file for batch input
-    print(f"\n[1/5] Creating batch input file...")
-    with tempfile.NamedTemporaryFile(
-        mode="w", suffix=".jsonl", delete=False, encoding="utf-8"
-    ) as f:
-        input_file_path = f.name
-        for idx, text in enumerate(texts):
-            payload = {
-                "custom_id": f"req_{idx}",
-                "method": "POST",
-                "url": "/v1/embeddings",
-                "body": {"model": model, "input": text, "encoding_format": "float"},
-            }
-            f.write(json.dumps(payload) + "\n")
-    print(f"      ✓ Created JSONL file with {len(texts)} requests")
-
+    # SQLite calls run off the event loop, and a busy or broken cache file
+    # falls back to embedding rather than failing the search
     try:
-        # Upload the file
-        print(f"\n[2/5] Uploading batch file to OpenAI...")
-        with open(input_file_path, "rb") as f:
-            file_obj = openai_client.files.create(file=f, purpose="batch")
-        input_file_id = file_obj.id
-        print(f"      ✓ File uploaded: {input_file_id}")
-
-        # Create batch job
-        print(f"\n[3/5] Creating batch job...")
-        batch_job = openai_client.batches.create(
-            input_file_id=input_file_id,
-            endpoint="/v1/embeddings",
-            completion_window="24h",
-        )
-        batch_id = batch_job.id
-        print(f"      ✓ Batch job created: {batch_id}")
-
-        # Poll until completion
-        print(f"\n[4/5] Processing batch (polling every 10s)...")
-        start_time = time.time()
-        last_completed = 0
-
-        while True:
-            job = openai_client.batches.retrieve(batch_id)
-            completed = job.request_counts.completed or 0
-            failed = job.request_counts.failed or 0
-            total = job.request_counts.total or 0
-
-            elapsed = int(time.time() - start_time)
-            progress_pct = (completed / total * 100) if total > 0 else 0
-
-            # Show progress bar
-            bar_length = 30
-            filled = int(bar_length * completed / total) if total > 0 else 0
-            bar = "█" * filled + "░" * (bar_length - filled)
-
-            print(
-                f"      [{bar}] {progress_pct:.1f}% | {completed}/{total} | {elapsed}s elapsed | Status: {job.status}",
-                end="\r",
-            )
-
-            if completed > last_completed:
-                last_completed = completed
-
-            if job.status in ("completed", "failed", "cancelled"):
-                print()  # New line after progress bar
-                break
+        cache = await asyncio.to_thread(get_embedding_cache)
+        if cache is None:
+            return await embed(texts)
+
+        keys = [EmbeddingCache.key(model, text) for text in texts]
+        found = await asyncio.to_thread(cache.get_many, keys)
+    except sqlite3.Error as e:
+        logger.warning("Embedding cache unavailable: %s", e)
+        return await embed(texts)
+
+    # Only embed texts that are not cached yet
+    misses = [i for i, key in enumerate(keys) if key not in found]
+    if misses:
+        vectors = await embed([texts[i] for i in misses])
+        new_items = [(keys[i], vector) for i, vector in zip(misses, vectors)]
+        found.update(new_items)
+        write = asyncio.ensure_future(asyncio.to_thread(cache.put_many, new_items))
+        _pending_cache_writes.add(write)
+        write.add_done_callback(_cache_write_done)
+        if wait_for_write:
+            await asyncio.wait({write})
+
+    return [found[key] for key in keys]
 
-            time.sleep(10)  # Check every 10 seconds
 
-        if job.status != "completed":
-            print(f"      ✗ Batch job failed with status: {job.status}")
-            raise RuntimeError(f"Batch job failed with status: {job.status}")
+def generate_embeddings_batch(
+    texts: list[str], model: str = EMBEDDING_MODEL
+) -> list[list[float]]:
+    """
+    Generate embeddings using OpenAI's embeddings endpoint in bulk requests.
 
-        print(f"      ✓ Batch processing completed in {elapsed}s")
-        if failed > 0:
-            print(f"      ⚠ Warning: {failed} requests failed")
+    Requests are sent concurrently, up to MAX_CONCURRENT_EMBEDDING_REQUESTS
+    at a time.
 
-        # Download results
-        print(f"\n[5/5] Downloading and parsing results...")
-        output_file_id = job.output_file_id
-        output_content = openai_client.files.content(output_file_id).text
+    Args:
+        texts: List of text strings to embed
+        model: OpenAI embedding model to use
 
-        # Parse results and sort by custom_id to maintain order
-        results = []
-        for line in output_content.splitlines():
-            if not line:
-                continue
-            entry = json.loads(line)
-            custom_id = entry.get("custom_id")
-            idx = int(custom_id.split("_")[1])
-            embedding = entry["response"]["body"]["data"][0]["embedding"]
-            results.append((idx, embedding))
+    Returns:
+        List of embedding vectors in the same order as input texts
+    """
+    if not texts:
+        return []
 
-        # Sort by index and return embeddings in original order
-        results.sort(key=lambda x: x[0])
-        embeddings = [emb for _, emb in results]
+    logger.info("Embedding %d texts with %s", len(texts), model)
+    vectors = asyncio.run(
+        _embed_cached(texts, model, lambda batch: _embed_async(batch, model))
+    )
+    logger.debug("Embedded %d texts", len(vectors))
 
-        print(f"      ✓ Retrieved {len(embeddings)} embeddings")
-        print(f"\n{'='*60}")
-        print(f"BATCH EMBEDDING COMPLETE")
-        print(f"{'='*60}\n")
+    return vectors
 
-        return embeddings
 
-    finally:
-        # Clean up temp file
-        if os.path.exists(input_file_path):
-            os.unlink(input_file_path)
+def _point_id(doc: dict) -> str:
+    """Derive a stable point ID from a chunk's source path and position."""
+    return str(uuid.uuid5(POINT_ID_NAMESPACE, f"{doc['source']}:{doc['chunk_id']}"))
 
 
 def add_documents_to_qdrant(documents: list[dict]):
     """
     Add documents to Qdrant with custom structure.
 
+    Point IDs are derived from source path and chunk ID, so re-ingesting a
+    file upserts its chunks in place instead of duplicating or clobbering
+    others, including same-named files in different directories.
+
     Expected document structure:
     {
         "text": str,
@@ -191,41 +281,45 @@ def add_documents_to_qdrant(documents: list[dict]):
         "tags": list[str],
         "chunk_id": int,
         "total_chunks": int,
-        "created": str (ISO timestamp)
+        "created": str (ISO timestamp),
+        "source": str (path relative to the ingest root; ID only, not stored)
     }
     """
     client = get_qdrant_client()
-    collection_name = os.getenv("QDRANT_COLLECTION_NAME")
+    collection_name = _COLLECTION_NAME
 
-    # Generate embeddings using batch API
+    # Generate embeddings in bulk requests
     texts = [doc["text"] for doc in documents]
     vectors = generate_embeddings_batch(texts)
 
-    # Create points
-    points = []
-    for i, (doc, vector) in enumerate(zip(documents, vectors)):
-        point = PointStruct(
-            id=i,  # Will be auto-generated by Qdrant if not provided
-            vector=vector,
-            payload={
-                "text": doc["text"],
-                "file_name": doc["file_name"],
-                "file_ext": doc["file_ext"],
-                "tags": doc["tags"],
-                "chunk_id": doc["chunk_id"],
-                "total_chunks": doc["total_chunks"],
-                "created": doc["created"],
-            },
-        )
-        points.append(point)
+    # Build payloads; vectors go over as one contiguous float32 array, built
+    # once and sliced into batches by the uploader
+    vectors_np = np.asarray(vectors, dtype=np.float32)
+    payloads = [{key: doc[key] for key in PAYLOAD_KEYS} for doc in documents]
+
+    # Upload to Qdrant in batches from this process: ingestion flushes a few
+    # hundred chunks at a time, too few to pay for upload_collection's worker
+    # processes (parallel > 1). Requests don't wait for indexing by default
+    client.upload_collection(
+        collection_name=collection_name,
+        vectors=vectors_np,
+        payload=payloads,
+        ids=[_point_id(doc) for doc in documents],
+        batch_size=QDRANT_UPLOAD_BATCH_SIZE,
+    )
+
+    return len(documents)
 
-    # Upload to Qdrant
-    client.upload_points(collection_name=collection_name, points=points)
 
-    return len(points)
+def _to_document(result) -> dict:
+    """Convert a Qdrant scored point into a document dict."""
+    payload = result.payload
+    document = {key: payload[key] for key in PAYLOAD_KEYS}
+    document["score"] = result.score
+    return document
 
 
-def search_documents(query: str, limit: int = 3) -> list[dict]:
+async def search_documents(query: str, limit: int = 3) -> list[dict]:
     """
     Search for documents in Qdrant.
 
@@ -241,31 +335,98 @@ def search_documents(query: str, limit: int = 3) -> list[dict]:
         "score": float
     }
     """
-    client = get_qdrant_client()
-    embeddings = get_embeddings()
-    collection_name = os.getenv("QDRANT_COLLECTION_NAME")
+    # Serve repeated queries without embedding or searching again
+    cached = query_cache.get(query, limit)
+    if cached is not None:
+        return cached
 
-    # Generate query embedding
-    query_vector = embeddings.embed_query(query)
+    collection_name = _COLLECTION_NAME
+
+    # Generate query embedding as float32, the precision Qdrant stores
+    vectors = await _embed_cached(
+        [query], EMBEDDING_MODEL, embed_queries, wait_for_write=False
+    )
+    query_vector = np.asarray(vectors[0], dtype=np.float32)
+
+    # Serve near-identical queries without searching again
+    cached = query_cache.get_similar(query_vector, limit)
+    if cached is not None:
+        return cached
 
     # Search
-    results = client.search(
-        collection_name=collection_name, query_vector=query_vector, limit=limit
+    client = get_async_qdrant_client()
+    response = await client.query_points(
+        collection_name=collection_name,
+        query=query_vector,
+        limit=limit,
+        search_params=SEARCH_PARAMS,
+        with_payload=True,
     )
+    results = response.points
 
     # Format results
-    documents = []
-    for result in results:
-        doc = {
-            "text": result.payload["text"],
-            "file_name": result.payload["file_name"],
-            "file_ext": result.payload["file_ext"],
-            "tags": result.payload["tags"],
-            "chunk_id": result.payload["chunk_id"],
-            "total_chunks": result.payload["total_chunks"],
-            "created": result.payload["created"],
-            "score": result.score,
-        }
-        documents.append(doc)
+    documents = [_to_document(result) for result in results]
+
+    query_cache.put(query, limit, query_vector, documents)
 
     return documents
+
+
+async def search_documents_batch(queries: list[str], limit: int = 3) -> list[list[dict]]:
+    """
+    Search for documents for several queries in one round-trip.
+
+    Queries are embedded in a single call and searched with one Qdrant
+    query_batch_points request; cached queries are served without either.
+
+    Returns one list of documents per query, in the same order as queries,
+    with the same structure as search_documents.
+    """
+    results = [query_cache.get(query, limit) for query in queries]
+    misses = [i for i, docs in enumerate(results) if docs is None]
+    if not misses:
+        return results
+
+    collection_name = _COLLECTION_NAME
+
+    # Generate all missing query embeddings at once, as float32 rows
+    vectors = np.asarray(
+        await _embed_cached(
+            [queries[i] for i in misses],
+            EMBEDDING_MODEL,
+            embed_queries,
+            wait_for_write=False,
+        ),
+        dtype=np.float32,
+    )
+
+    # Serve near-identical queries without searching again
+    pending = []
+    for i, vector in zip(misses, vectors):
+        cached = query_cache.get_similar(vector, limit)
+        if cached is not None:
+            results[i] = cached
+        else:
+            pending.append((i, vector))
+
+    if not pending:
+        return results
+
+    # Search
+    client = get_async_qdrant_client()
+    responses = await client.query_batch_points(
+        collection_name=collection_name,
+        requests=[
+            QueryRequest(
+                query=vector, limit=limit, params=SEARCH_PARAMS, with_payload=True
+            )
+            for _, vector in pending
+        ],
+    )
+
+    for (i, vector), response in zip(pending, responses):
+        documents = [_to_document(point) for point in response.points]
+        query_cache.put(queries[i], limit, vector, documents)
+        results[i] = documents
+
+    return results
@@ -1,36 +1,78 @@
-"""Simple test script for the RAG API."""
+"""Simple test and load script for the RAG API."""
 
-import requests
+import asyncio
 import json
+import time
+import aiohttp
 
+BASE_URL = "http://localhost:8000"
 
-def test_health():
+
+async def test_health(session: aiohttp.ClientSession):
     """Test health check endpoint."""
-    response = requests.get("http://localhost:8000/")
-    print("Health Check:")
-    print(json.dumps(response.json(), indent=2))
-    print()
+    async with session.get(f"{BASE_URL}/") as response:
+        print("Health Check:")
+        print(json.dumps(await response.json(), indent=2))
+        print()
+
+
+async def test_chat(
+    session: aiohttp.ClientSession, semaphore: asyncio.Semaphore, query: str
+) -> bool:
+    """Test chat endpoint - the agent searches Qdrant and uses the LLM to answer."""
+    async with semaphore:
+        async with session.post(f"{BASE_URL}/chat", json={"query": query}) as response:
+            if response.status == 200:
+                result = await response.json()
+                print(f"Query: {result['query']}")
+                print(f"\nAnswer: {result['answer']}")
+                print(f"\n(Tools used: {', '.join(result['tool_calls']) or 'none'})\n")
+                return True
+
+            print(f"Error: {response.status}")
+            print(await response.text())
+            return False
+
 
+async def run_queries(queries: list[str], concurrency: int = 10):
+    """Fire all queries at /chat concurrently, capped at `concurrency` in flight."""
+    semaphore = asyncio.Semaphore(concurrency)
 
-def test_chat(query: str):
-    """Test chat endpoint - retrieves docs from Qdrant and uses LLM to generate answer."""
-    response = requests.post("http://localhost:8000/chat", json={"query": query})
+    async with aiohttp.ClientSession() as session:
+        # Test health
+        await test_health(session)
 
-    if response.status_code == 200:
-        result = response.json()
-        print(f"Query: {result['query']}")
-        print(f"\nAnswer: {result['answer']}")
-        print(f"\n(Used {result['sources_count']} source documents)")
-    else:
-        print(f"Error: {response.status_code}")
-        print(response.text)
+        # Test chat
+        start = time.perf_counter()
+        results = await asyncio.gather(
+            *(test_chat(session, semaphore, query) for query in queries)
+        )
+        elapsed = time.perf_counter() - start
+
+    succeeded = sum(results)
+    print("=" * 50)
+    print(f"{succeeded}/{len(queries)} requests succeeded in {elapsed:.2f}s")
+    print(f"Throughput: {len(queries) / elapsed:.2f} requests/s")
 
 
 if __name__ == "__main__":
-    print("Testing RAG API\n" + "=" * 50 + "\n")
+    import argparse
 
-    # Test health
-    test_health()
+    parser = argparse.ArgumentParser(description="Test and load the RAG API")
+    parser.add_argument(
+        "--requests",
+        type=int,
+        default=1,
+        help="Number of /chat requests to send (default: 1)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=10,
+        help="Maximum number of requests in flight (default: 10)",
+    )
 
-    # Test chat
-    test_chat("jayed's skills?")
+    args = parser.parse_args()
+
+    print("Testing RAG API\n" + "=" * 50 + "\n")
+    asyncio.run(run_queries(["jayed's skills?"] * args.requests, args.concurrency))